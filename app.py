@@ -1,7 +1,7 @@
 """
 Main Flask application entry point for Job Market Trends Predictive Analytics
 """
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
+from flask import Flask, request, jsonify, redirect, url_for, session
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from werkzeug.security import check_password_hash, generate_password_hash
 from werkzeug.utils import secure_filename
@@ -9,15 +9,20 @@ import os
 from datetime import datetime
 import json
 
+from jinja2 import FileSystemBytecodeCache
+
+from extensions import cache, compress
 from models.user import User
 from routes.main import main_bp
 from routes.api import api_bp
 from routes.admin import admin_bp
+from routes.responses import OrjsonProvider, error_page
 from services.auth_service import init_auth_users
 
 # Initialize Flask app
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+app.json = OrjsonProvider(app)
 
 # Configure upload settings
 UPLOAD_FOLDER = 'uploads'
@@ -25,6 +30,32 @@ ALLOWED_EXTENSIONS = {'csv', 'json'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
+# Configure caching for deterministic, rarely-changing views/services
+cache.init_app(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+
+# Compress responses (brotli preferred, gzip fallback); tiny payloads aren't worth it
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 512
+compress.init_app(app)
+
+def warm_templates(flask_app, cache_dir=None):
+    """Pin compiled templates in memory and skip per-render stat() checks"""
+    if cache_dir is None:
+        cache_dir = os.path.join(flask_app.instance_path, 'jinja_cache')
+    flask_app.config['TEMPLATES_AUTO_RELOAD'] = False
+    jinja_env = flask_app.jinja_env
+    jinja_env.auto_reload = False
+    jinja_env.cache = {}  # unbounded: the template set is small and fixed
+    os.makedirs(cache_dir, exist_ok=True)
+    jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    # Compile everything at boot so the first request doesn't parse templates
+    for name in jinja_env.list_templates(extensions=['html']):
+        jinja_env.get_template(name)
+
+# `python app.py` runs the debug server below, which keeps template reloading
+if not app.debug and __name__ != '__main__':
+    warm_templates(app)
+
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs('models', exist_ok=True)
@@ -41,7 +72,7 @@ def load_user(user_id):
     return User.get(user_id)
 
 # Initialize default admin user
-init_auth_users()
+init_auth_users(app.instance_path)
 
 # Register blueprints
 app.register_blueprint(main_bp)
@@ -51,12 +82,12 @@ app.register_blueprint(admin_bp, url_prefix='/admin')
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return render_template('errors/404.html'), 404
+    return error_page(404)
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    return render_template('errors/500.html'), 500
+    return error_page(500)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,11 @@
+"""
+Flask extension instances shared by the app, blueprints and services
+
+Created unbound here and initialized in app.py, so modules can import them
+without importing the app itself.
+"""
+from flask_caching import Cache
+from flask_compress import Compress
+
+cache = Cache()
+compress = Compress()
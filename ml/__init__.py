@@ -1,7 +1,13 @@
 """
 ML models package for Job Market Trends Analytics
 """
-from .model import JobMarketPredictor
-
 __all__ = ['JobMarketPredictor']
 
+
+def __getattr__(name):
+    # Resolved on first access: ml.model imports TensorFlow, which the
+    # pure-pandas submodules (e.g. ml.aggregation) must not pull in
+    if name == 'JobMarketPredictor':
+        from .model import JobMarketPredictor
+        return JobMarketPredictor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
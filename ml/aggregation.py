@@ -0,0 +1,118 @@
+"""
+Monthly aggregation of job postings for demand forecasting
+
+Pure pandas, so callers such as the upload route can build the monthly
+sidecar without importing TensorFlow.
+"""
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+LOGGER = logging.getLogger(__name__)
+
+
+def ranked_value_counts(values, n=None) -> pd.Series:
+    """
+    Count values, most frequent first, with ties kept in first-appearance order.
+    
+    `Series.value_counts` breaks ties by category order (alphabetical) on
+    categorical columns, which would change which roles make a top-N cut.
+    Factorizing numbers the values by first appearance, so a stable sort on
+    the counts keeps that order; on categoricals it works on the integer codes.
+    
+    Args:
+        values: Series of values (object, string or categorical); NaN is skipped
+        n: Keep only the `n` most frequent values
+    """
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    order = np.argsort(-counts, kind='stable')[:n]
+    return pd.Series(
+        counts[order],
+        index=pd.Index(np.asarray(uniques, dtype=object)[order]),
+        name='count'
+    )
+
+
+def build_monthly_frame(df) -> Optional[pd.DataFrame]:
+    """
+    Aggregate postings per month for the top roles in the dataset.
+    
+    Args:
+        df: DataFrame with job postings data
+        
+    Returns:
+        Long DataFrame with `role`, `date` and `count` columns, roles in
+        descending frequency order, or None when the dataset cannot be
+        used for LSTM forecasting
+    """
+    role_col = next((col for col in ['job_title', 'job_role', 'role'] if col in df.columns), None)
+    if role_col is None:
+        LOGGER.warning("Role column missing. Falling back to frequency-based predictions.")
+        return None
+    
+    if 'date' not in df.columns:
+        LOGGER.warning("Date column missing. Falling back to frequency-based predictions.")
+        return None
+    
+    # Only the columns the aggregation needs; avoids copying the whole upload
+    work_df = pd.DataFrame({
+        'date': pd.to_datetime(df['date'], errors='coerce'),
+        # Categorical roles turn the counting, filtering and grouping
+        # below into integer operations on the category codes
+        role_col: df[role_col].astype('category')
+    })
+    if 'postings_count' in df.columns:
+        work_df['postings_count'] = df['postings_count'].to_numpy()
+    work_df.dropna(subset=['date'], inplace=True)
+    if work_df.empty:
+        LOGGER.warning("All date rows invalid. Falling back to frequency-based predictions.")
+        return None
+    
+    role_counts = ranked_value_counts(work_df[role_col], 10)
+    if role_counts.empty:
+        LOGGER.warning("No roles available after filtering. Using default predictions.")
+        return None
+    
+    role_series = build_monthly_series(work_df, role_col, role_counts.index)
+    return pd.concat(
+        [
+            pd.DataFrame({'role': role, 'date': series.index, 'count': series.to_numpy()})
+            for role, series in role_series
+        ],
+        ignore_index=True
+    )
+
+
+def build_monthly_series(work_df: pd.DataFrame, role_col: str, roles) -> list:
+    """
+    Aggregate postings per month for each role.
+    
+    The frame is sorted and indexed once and every role is resampled in
+    a single groupby, instead of slicing and sorting per role. The role
+    column must be categorical.
+    
+    Returns:
+        List of (role, monthly series) pairs in the order of `roles`
+    """
+    # Dates are parsed once by build_monthly_frame; never re-parse per role.
+    assert is_datetime64_any_dtype(work_df['date']), "date column must be parsed"
+    roles_cat = work_df[role_col].cat
+    top_codes = roles_cat.categories.get_indexer(roles)
+    work_df = work_df[np.isin(roles_cat.codes.to_numpy(), top_codes)]
+    work_df = work_df.sort_values('date').set_index('date')
+    grouped = work_df.groupby(role_col, observed=True, sort=False)
+    if 'postings_count' in work_df.columns:
+        monthly = grouped['postings_count'].resample('ME').sum()
+    else:
+        monthly = grouped.resample('ME').size()
+    
+    # Split the aggregate in one pass rather than one index scan per role
+    by_role = {
+        role: series.droplevel(0)
+        for role, series in monthly.groupby(level=0, observed=True, sort=False)
+    }
+    return [(role, by_role[role].asfreq('ME', fill_value=0)) for role in roles]
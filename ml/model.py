@@ -3,19 +3,52 @@ ML Model for Job Market Predictions
 """
 import logging
 import os
+import threading
+from functools import lru_cache
 from typing import Optional, Tuple
 
 import joblib
 import numpy as np
 import pandas as pd
+import tensorflow as tf
 from tensorflow.keras.models import load_model
 
+from services.json_cache import load_json
+
+from .aggregation import build_monthly_frame, ranked_value_counts
+from .train_lstm import convert_to_tflite, tflite_filename
+
 LOGGER = logging.getLogger(__name__)
 
+# Inference runs on (1, 12, 1) windows, where GPU transfers and thread-pool
+# wake-ups cost far more than the math itself.
+INFERENCE_DEVICE = '/CPU:0'
+INFERENCE_THREADS = 1
+
+try:
+    tf.config.threading.set_intra_op_parallelism_threads(INFERENCE_THREADS)
+    # Predictions may run on a thread pool; keep TF from oversubscribing cores.
+    tf.config.threading.set_inter_op_parallelism_threads(INFERENCE_THREADS)
+except RuntimeError:
+    # The TF runtime was already initialized by another import.
+    LOGGER.debug("TensorFlow threading already configured; keeping existing settings.")
+
 
+# Used by recommend_jobs when data/skills_database.json is missing
+DEFAULT_SKILLS_DB = {
+    'Data Scientist': ['Python', 'SQL', 'Machine Learning', 'Statistics'],
+    'Software Engineer': ['Programming', 'Algorithms', 'System Design'],
+    'ML Engineer': ['Python', 'Machine Learning', 'MLOps', 'Cloud']
+}
+
+_MISSING = object()  # cache sentinel; distinguishes "not loaded" from stored values
+_SLUG_TABLE = str.maketrans({' ': '_', '/': '-'})
+
+
+@lru_cache(maxsize=256)
 def slugify_role(role: str) -> str:
     """Create a filesystem-friendly slug for a job role."""
-    return role.strip().lower().replace(" ", "_").replace("/", "-")
+    return role.strip().lower().translate(_SLUG_TABLE)
 
 
 class JobMarketPredictor:
@@ -23,126 +56,202 @@ class JobMarketPredictor:
     Main predictor class for job market analytics
     """
     
-    def __init__(self):
-        """Initialize the predictor with models"""
+    def __init__(self, allow_int8=None):
+        """
+        Initialize the predictor with models
+        
+        Args:
+            allow_int8: Prefer int8 TFLite models exported by
+                `train_lstm.py --quantization int8`. Defaults to the
+                LSTM_ALLOW_INT8=1 environment flag, since int8 kernels are
+                only faster on some CPUs.
+        """
         self.models_dir = 'models'
+        if allow_int8 is None:
+            allow_int8 = os.environ.get('LSTM_ALLOW_INT8') == '1'
+        self.allow_int8 = allow_int8
         os.makedirs(self.models_dir, exist_ok=True)
         
         self.window_size = 12
-        self.lstm_models = {}
-        self.scalers = {}
+        self._resources = {}  # slug -> (model, scaler)
+        # TFLite interpreters are not thread-safe and the predictor may be
+        # shared across request threads; also avoids duplicate model loads.
+        self._lock = threading.Lock()
+        
+        self.skills_file = 'data/skills_database.json'
         
     # ------------------------------------------------------------------
     # Demand Forecasting
     # ------------------------------------------------------------------
-    def predict_demand(self, df):
+    def predict_demand(self, df, monthly=None, as_records=True):
         """
         Predict job demand for roles in the dataset using LSTM models
         with graceful fallbacks to traditional heuristics.
-        """
-        role_col = next((col for col in ['job_title', 'job_role', 'role'] if col in df.columns), None)
-        if role_col is None:
-            LOGGER.warning("Role column missing. Falling back to frequency-based predictions.")
-            return self._fallback_predictions(df)
-        
-        if 'date' not in df.columns:
-            LOGGER.warning("Date column missing. Falling back to frequency-based predictions.")
-            return self._fallback_predictions(df)
-        
-        work_df = df.copy()
-        work_df['date'] = pd.to_datetime(work_df['date'], errors='coerce')
-        work_df = work_df.dropna(subset=['date'])
-        if work_df.empty:
-            LOGGER.warning("All date rows invalid. Falling back to frequency-based predictions.")
-            return self._fallback_predictions(df)
         
-        role_counts = work_df[role_col].value_counts().head(10)
-        if role_counts.empty:
-            LOGGER.warning("No roles available after filtering. Using default predictions.")
-            return self._fallback_predictions(df)
+        Args:
+            df: DataFrame with job postings data
+            monthly: Optional frame from `build_monthly_frame` (e.g. a cached
+                upload sidecar); skips re-aggregating `df` when given
+            as_records: Return a list of dicts (legacy format) instead of a
+                columnar DataFrame with one row per role
+        """
+        if monthly is None:
+            monthly = self.build_monthly_frame(df)
+        if monthly is None:
+            return self._fallback_predictions(df, as_records=as_records)
         
-        predictions = []
-        for role in role_counts.index:
-            role_df = work_df[work_df[role_col] == role]
-            prediction = self._predict_role_with_lstm(role, role_df)
-            predictions.append(prediction)
-        return predictions
+        role_series = [
+            (role, group.set_index('date')['count'].asfreq('ME', fill_value=0))
+            for role, group in monthly.groupby('role', sort=False, observed=True)
+        ]
+        predictions = self._predict_roles_with_lstm(role_series)
+        return predictions.to_dict(orient='records') if as_records else predictions
     
-    def _predict_role_with_lstm(self, role: str, role_df: pd.DataFrame) -> dict:
-        """Generate demand prediction for a single role."""
-        series = self._build_monthly_series(role_df)
-        current_demand = int(series.iloc[-1]) if not series.empty else 0
-        
-        predicted_value = None
-        confidence = 0.65  # default fallback
-        
-        if len(series) >= self.window_size:
-            model, scaler = self._load_lstm_resources(role)
-            if model and scaler:
-                predicted_value = self._predict_with_model(series, model, scaler)
-                confidence = 0.92
-            else:
+    def build_monthly_frame(self, df) -> Optional[pd.DataFrame]:
+        """Aggregate postings per month for the top roles (see `ml.aggregation`)."""
+        return build_monthly_frame(df)
+    
+    def _predict_roles_with_lstm(self, role_series) -> pd.DataFrame:
+        """Generate demand predictions for several roles."""
+        series_by_role = list(role_series)
+        predicted = np.empty(len(series_by_role), dtype=np.float64)
+        from_lstm = np.zeros(len(series_by_role), dtype=bool)
+        for idx, (role, series) in enumerate(series_by_role):
+            # Each role has its own model file, so every call is one window
+            if len(series) >= self.window_size:
+                model, scaler = self._load_lstm_resources(role)
+                if model and scaler:
+                    predicted[idx] = self._predict_with_model(series, model)
+                    from_lstm[idx] = True
+                    continue
                 LOGGER.warning("Missing LSTM resources for %s. Using moving average.", role)
+            predicted[idx] = self._moving_average(series)
         
-        if predicted_value is None:
-            predicted_value = self._moving_average(series)
-        
-        predicted_value = max(0, float(predicted_value))
-        growth_rate = (
-            ((predicted_value - current_demand) / current_demand) * 100
-            if current_demand > 0 else 0
+        return self._build_predictions(
+            [role for role, _ in series_by_role],
+            np.array([series.iloc[-1] if not series.empty else 0 for _, series in series_by_role], dtype=np.int64),
+            predicted,
+            np.where(from_lstm, 0.92, 0.65)  # 0.65: moving-average fallback
         )
-        
-        return {
-            'role': role,
-            'current_demand': int(current_demand),
-            'demand': int(round(predicted_value)),
-            'growth_rate': round(growth_rate, 2),
-            'confidence': round(confidence, 2)
-        }
     
-    def _build_monthly_series(self, role_df: pd.DataFrame) -> pd.Series:
-        """Aggregate postings per month for a role."""
-        role_df = role_df.sort_values('date').set_index('date')
-        if 'postings_count' in role_df.columns:
-            series = role_df['postings_count'].resample('M').sum()
-        else:
-            series = role_df.resample('M').size()
-        series = series.asfreq('M', fill_value=0)
-        return series
+    def _build_predictions(self, roles, current_demand: np.ndarray, predicted: np.ndarray,
+                           confidence) -> pd.DataFrame:
+        """Assemble the columnar prediction frame (one row per role)."""
+        predicted = np.maximum(predicted, 0)
+        growth_rate = np.divide(
+            (predicted - current_demand) * 100, current_demand,
+            out=np.zeros_like(predicted), where=current_demand > 0
+        )
+        return pd.DataFrame({
+            'role': roles,
+            'current_demand': current_demand,
+            'demand': np.round(predicted).astype(np.int64),
+            'growth_rate': np.round(growth_rate, 2),
+            'confidence': np.round(np.broadcast_to(confidence, predicted.shape), 2)
+        })
     
     def _load_lstm_resources(self, role: str) -> Tuple[Optional[object], Optional[object]]:
         """Load (and cache) LSTM model + scaler for a role."""
         slug = slugify_role(role)
-        if slug in self.lstm_models and slug in self.scalers:
-            return self.lstm_models[slug], self.scalers[slug]
+        cached = self._resources.get(slug, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        
+        with self._lock:
+            return self._load_lstm_resources_locked(role, slug)
+    
+    def _load_lstm_resources_locked(self, role: str, slug: str):
+        """Load resources for `slug`; caller must hold `self._lock`."""
+        cached = self._resources.get(slug, _MISSING)
+        if cached is not _MISSING:
+            return cached
         
         model_path = os.path.join(self.models_dir, f'lstm_{slug}.keras')
         scaler_path = os.path.join(self.models_dir, f'scaler_{slug}.pkl')
-        
-        if not os.path.exists(model_path) or not os.path.exists(scaler_path):
-            LOGGER.warning("LSTM model or scaler missing for %s.", role)
-            return None, None
+        tflite_path = os.path.join(self.models_dir, tflite_filename(slug, 'fp16'))
+        int8_path = os.path.join(self.models_dir, tflite_filename(slug, 'int8'))
         
         try:
-            model = load_model(model_path)
             scaler = joblib.load(scaler_path)
-            self.lstm_models[slug] = model
-            self.scalers[slug] = scaler
-            LOGGER.info("Loaded LSTM model for %s", role)
-            return model, scaler
+            model = self._load_tflite_runner(
+                model_path, tflite_path, int8_path if self.allow_int8 else None
+            )
+        except FileNotFoundError:
+            LOGGER.warning("LSTM model or scaler missing for %s.", role)
+            return None, None
         except Exception as exc:
             LOGGER.error("Failed to load LSTM resources for %s: %s", role, exc)
             return None, None
+        
+        # Keep the MinMax affine terms with the model so inference can
+        # scale the input window inline instead of calling sklearn.
+        model['scale'] = scaler.scale_.item()
+        model['min'] = scaler.min_.item()
+        self._resources[slug] = (model, scaler)
+        LOGGER.info("Loaded LSTM model for %s", role)
+        return model, scaler
+    
+    def _load_tflite_runner(self, model_path: str, tflite_path: str,
+                            int8_path: Optional[str] = None) -> dict:
+        """
+        Build a TFLite interpreter for a saved Keras model.
+        
+        The float16-quantized FlatBuffer is written next to the `.keras` file
+        so the conversion only runs once per trained model. An up-to-date
+        int8 export is preferred when `int8_path` is given.
+        
+        Raises:
+            FileNotFoundError: If the `.keras` model does not exist
+        """
+        model_mtime = os.stat(model_path).st_mtime
+        
+        tflite_bytes = None
+        for path in (int8_path, tflite_path):
+            if not path:
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_mtime >= model_mtime:
+                        tflite_bytes = f.read()
+                        break
+            except FileNotFoundError:
+                continue
+        
+        if tflite_bytes is None:
+            with tf.device(INFERENCE_DEVICE):
+                tflite_bytes = convert_to_tflite(load_model(model_path), 'fp16')
+            try:
+                with open(tflite_path, 'wb') as f:
+                    f.write(tflite_bytes)
+            except OSError as exc:
+                LOGGER.warning("Could not cache TFLite model at %s: %s", tflite_path, exc)
+        
+        interpreter = tf.lite.Interpreter(
+            model_content=tflite_bytes, num_threads=INFERENCE_THREADS
+        )
+        interpreter.allocate_tensors()
+        return {
+            'interpreter': interpreter,
+            'input_index': interpreter.get_input_details()[0]['index'],
+            'output_index': interpreter.get_output_details()[0]['index'],
+        }
     
-    def _predict_with_model(self, series: pd.Series, model, scaler) -> float:
-        """Invoke the LSTM model on the most recent window."""
-        values = series.values.reshape(-1, 1)
-        scaled = scaler.transform(values)
-        input_seq = scaled[-self.window_size:]
-        input_seq = np.expand_dims(input_seq, axis=0)
-        prediction = model.predict(input_seq, verbose=0)
-        return scaler.inverse_transform(prediction)[0][0]
+    def _predict_with_model(self, series: pd.Series, model) -> float:
+        """Invoke the LSTM model on the most recent window of the series."""
+        scale, offset = model['scale'], model['min']
+        tail = series.values[-self.window_size:].astype(np.float32)
+        window = (tail * scale + offset).reshape(1, self.window_size, 1)
+        
+        prediction = self._run_model(model, window)
+        return float((prediction[0, 0] - offset) / scale)
+    
+    def _run_model(self, model, window: np.ndarray) -> np.ndarray:
+        """Run a single (1, window, 1) input through a cached TFLite interpreter."""
+        interpreter = model['interpreter']
+        with self._lock:
+            interpreter.set_tensor(model['input_index'], window)
+            interpreter.invoke()
+            return interpreter.get_tensor(model['output_index']).copy()
     
     def _moving_average(self, series: pd.Series) -> float:
         """Simple moving average fallback."""
@@ -151,31 +260,30 @@ class JobMarketPredictor:
         window = min(self.window_size, len(series))
         return float(series.tail(window).mean())
     
-    def _fallback_predictions(self, df: pd.DataFrame):
+    def _fallback_predictions(self, df: pd.DataFrame, as_records=True):
         """Legacy heuristic predictions when LSTM cannot run."""
+        # First-appearance tie order, also for categorical columns
         if 'job_title' in df.columns:
-            roles = df['job_title'].value_counts().head(10)
+            roles = ranked_value_counts(df['job_title'], 10)
         elif 'role' in df.columns:
-            roles = df['role'].value_counts().head(10)
+            roles = ranked_value_counts(df['role'], 10)
         else:
             roles = pd.Series({'Data Scientist': 150, 'Software Engineer': 200})
         
-        predictions = []
-        for role, count in roles.items():
-            growth_factor = 1.05
-            predicted_demand = int(count * growth_factor)
-            predictions.append({
-                'role': role,
-                'current_demand': int(count),
-                'demand': predicted_demand,
-                'growth_rate': round((growth_factor - 1) * 100, 2),
-                'confidence': 0.5
-            })
-        return predictions
+        growth_factor = 1.05
+        counts = roles.to_numpy(dtype=np.int64)
+        predictions = pd.DataFrame({
+            'role': roles.index.tolist(),
+            'current_demand': counts,
+            'demand': (counts * growth_factor).astype(np.int64),
+            'growth_rate': round((growth_factor - 1) * 100, 2),
+            'confidence': 0.5
+        })
+        return predictions.to_dict(orient='records') if as_records else predictions
     
-    def fallback_predictions(self, df: pd.DataFrame):
+    def fallback_predictions(self, df: pd.DataFrame, as_records=True):
         """Public wrapper to expose fallback predictions."""
-        return self._fallback_predictions(df)
+        return self._fallback_predictions(df, as_records=as_records)
     
     def analyze_skill_gaps(self, df):
         """
@@ -190,13 +298,12 @@ class JobMarketPredictor:
         # Extract skills if available
         if 'skills' in df.columns or 'required_skills' in df.columns:
             skills_col = 'skills' if 'skills' in df.columns else 'required_skills'
-            all_skills = []
-            for skills_str in df[skills_col].dropna():
-                if isinstance(skills_str, str):
-                    skills = [s.strip() for s in skills_str.split(',')]
-                    all_skills.extend(skills)
-            
-            skill_counts = pd.Series(all_skills).value_counts()
+            skill_counts = (
+                df[skills_col].dropna().astype(str)
+                .str.split(',').explode().str.strip()
+                .loc[lambda s: s != '']
+                .value_counts()
+            )
             
             return {
                 'top_skills': skill_counts.head(10).to_dict(),
@@ -227,10 +334,11 @@ class JobMarketPredictor:
         Returns:
             List of saturation scores per role
         """
+        # First-appearance tie order, also for categorical columns
         if 'job_title' in df.columns:
-            roles = df['job_title'].value_counts()
+            roles = ranked_value_counts(df['job_title'])
         elif 'role' in df.columns:
-            roles = df['role'].value_counts()
+            roles = ranked_value_counts(df['role'])
         else:
             roles = pd.Series({'Data Scientist': 150, 'Software Engineer': 200})
         
@@ -250,6 +358,10 @@ class JobMarketPredictor:
         
         return saturation_scores
     
+    def _get_skills_db(self):
+        """Return the job role skills database (shared, read-only; re-read only when it changes)."""
+        return load_json(self.skills_file, default=DEFAULT_SKILLS_DB)
+    
     def recommend_jobs(self, user_skills, n_recommendations=5):
         """
         Recommend jobs based on user skills
@@ -264,26 +376,16 @@ class JobMarketPredictor:
         # This is a simplified rule-based approach
         # In production, you'd use a trained classifier
         
-        # Load job role skills database
-        skills_file = 'data/skills_database.json'
-        if os.path.exists(skills_file):
-            import json
-            with open(skills_file, 'r') as f:
-                role_skills = json.load(f)
-        else:
-            role_skills = {
-                'Data Scientist': ['Python', 'SQL', 'Machine Learning', 'Statistics'],
-                'Software Engineer': ['Programming', 'Algorithms', 'System Design'],
-                'ML Engineer': ['Python', 'Machine Learning', 'MLOps', 'Cloud']
-            }
-        
         recommendations = []
-        user_skills_lower = [s.lower() for s in user_skills]
+        user_set = {s.lower() for s in user_skills}
         
-        for role, required_skills in role_skills.items():
-            required_lower = [s.lower() for s in required_skills]
-            matches = sum(1 for s in required_lower if s in user_skills_lower)
-            match_score = (matches / len(required_skills) * 100) if required_skills else 0
+        for role, required_skills in self._get_skills_db().items():
+            if not required_skills:
+                matches, match_score = 0, 0
+            else:
+                required_set = {s.lower() for s in required_skills}
+                matches = len(required_set & user_set)
+                match_score = matches / len(required_skills) * 100
             
             recommendations.append({
                 'role': role,
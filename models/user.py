@@ -4,6 +4,7 @@ User model for authentication
 class User:
     """Simple user model for Flask-Login"""
     users = {}  # In-memory storage (replace with DB in production)
+    users_by_name = {}  # Secondary index for login lookups
     
     def __init__(self, id, username, password_hash, is_admin=False):
         self.id = id
@@ -23,12 +24,18 @@ class User:
         """Get user by ID"""
         return cls.users.get(str(user_id))
     
+    @classmethod
+    def get_by_username(cls, username):
+        """Get user by username"""
+        return cls.users_by_name.get(username)
+    
     @classmethod
     def create(cls, username, password_hash, is_admin=False):
         """Create a new user"""
         user_id = str(len(cls.users) + 1)
         user = cls(user_id, username, password_hash, is_admin)
         cls.users[user_id] = user
+        cls.users_by_name[username] = user
         return user
     
     def check_password(self, password):
@@ -6,11 +6,13 @@ from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import check_password_hash
 from werkzeug.utils import secure_filename
 from models.user import User
-import json
+from services.json_cache import load_json, read_json, write_json
 import os
 
 admin_bp = Blueprint('admin', __name__)
 
+SKILLS_FILE = 'data/skills_database.json'
+
 @admin_bp.route('/login', methods=['GET', 'POST'])
 def login():
     """Admin login page"""
@@ -19,11 +21,7 @@ def login():
         password = request.form.get('password')
         
         # Find user
-        user = None
-        for u in User.users.values():
-            if u.username == username:
-                user = u
-                break
+        user = User.get_by_username(username)
         
         if user and user.check_password(password):
             login_user(user)
@@ -60,30 +58,20 @@ def manage_skills():
         job_role = data.get('job_role')
         skills = data.get('skills', [])
         
-        # Update skills database
-        skills_file = 'data/skills_database.json'
-        if os.path.exists(skills_file):
-            with open(skills_file, 'r') as f:
-                skills_db = json.load(f)
-        else:
+        # Update skills database; parse a fresh mutable copy, since the
+        # cached load_json result is shared and read-only
+        try:
+            skills_db = read_json(SKILLS_FILE)
+        except FileNotFoundError:
             skills_db = {}
-        
         skills_db[job_role] = skills
         
-        with open(skills_file, 'w') as f:
-            json.dump(skills_db, f, indent=2)
+        write_json(SKILLS_FILE, skills_db)
         
         return jsonify({'success': True, 'message': 'Skills updated'})
     
     # GET: Return skills database
-    skills_file = 'data/skills_database.json'
-    if os.path.exists(skills_file):
-        with open(skills_file, 'r') as f:
-            skills_db = json.load(f)
-    else:
-        skills_db = {}
-    
-    return jsonify({'success': True, 'skills': skills_db})
+    return jsonify({'success': True, 'skills': load_json(SKILLS_FILE, default={})})
 
 @admin_bp.route('/upload-dataset', methods=['POST'])
 @login_required
@@ -5,11 +5,14 @@ from flask import Blueprint, request, jsonify, send_file
 from werkzeug.utils import secure_filename
 import os
 import json
-from services.prediction_service import process_dataset, run_prediction
+from services.prediction_service import (
+    process_dataset, run_prediction, cache_monthly_series,
+    submit_prediction, get_prediction_status
+)
 from services.skill_service import analyze_skill_gap, get_required_skills
 from services.recommendation_service import get_job_recommendations
 from services.data_service import get_trends_data, search_job_role
-from ml.model import JobMarketPredictor
+from routes.responses import conditional
 
 api_bp = Blueprint('api', __name__)
 
@@ -31,6 +34,8 @@ def upload_file():
         filename = secure_filename(file.filename)
         filepath = os.path.join('uploads', filename)
         file.save(filepath)
+        # Aggregate once so repeated /predict calls skip the groupby/resample
+        cache_monthly_series(filepath)
         
         return jsonify({
             'success': True,
@@ -53,6 +58,15 @@ def predict():
     if not os.path.exists(filepath):
         return jsonify({'error': 'File not found'}), 404
     
+    if data.get('async'):
+        # Run in the background; poll /api/predict/<job_id> for the results
+        job_id = submit_prediction(filepath)
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'pending'
+        }), 202
+    
     try:
         results = run_prediction(filepath)
         return jsonify({
@@ -62,6 +76,16 @@ def predict():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@api_bp.route('/predict/<job_id>', methods=['GET'])
+def predict_status(job_id):
+    """Poll a background prediction started with {"async": true}"""
+    job = get_prediction_status(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] == 'error':
+        return jsonify({'success': False, **job}), 500
+    return jsonify({'success': True, **job})
+
 @api_bp.route('/skill-gap', methods=['POST'])
 def api_skill_gap():
     """API endpoint for skill gap analysis"""
@@ -102,10 +126,10 @@ def api_trends(job_role):
     """Get trends data for a specific job role"""
     try:
         trends = get_trends_data(job_role)
-        return jsonify({
+        return conditional(jsonify({
             'success': True,
             'trends': trends
-        })
+        }))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -128,10 +152,12 @@ def api_search():
 @api_bp.route('/dashboard/stats', methods=['GET'])
 def dashboard_stats():
     """Get dashboard statistics"""
+    # get_dashboard_stats is cached itself; the response is not, so each
+    # request gets its own conditional (ETag / 304) evaluation
     from services.data_service import get_dashboard_stats
     stats = get_dashboard_stats()
-    return jsonify({
+    return conditional(jsonify({
         'success': True,
         'stats': stats
-    })
+    }))
 
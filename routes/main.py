@@ -1,11 +1,12 @@
 """
 Main routes for public pages
 """
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, render_template, request, jsonify, make_response
 from services.data_service import get_dashboard_stats, get_trends_data, search_job_role
 from services.skill_service import get_required_skills, analyze_skill_gap
 from services.recommendation_service import get_job_recommendations
 from services.blog_service import get_all_posts, get_post_by_id
+from routes.responses import conditional, error_page
 
 main_bp = Blueprint('main', __name__)
 
@@ -49,13 +50,13 @@ def trends():
 def blog():
     """Blog/insights listing page"""
     posts = get_all_posts()
-    return render_template('blog.html', posts=posts)
+    return conditional(make_response(render_template('blog.html', posts=posts)))
 
 @main_bp.route('/blog/<post_id>')
 def blog_post(post_id):
     """Individual blog post page"""
     post = get_post_by_id(post_id)
     if not post:
-        return render_template('errors/404.html'), 404
+        return error_page(404)
     return render_template('blog_post.html', post=post)
 
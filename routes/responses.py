@@ -0,0 +1,61 @@
+"""
+JSON provider and response helpers shared by the route blueprints
+"""
+from types import MappingProxyType
+
+import orjson
+from flask import current_app, render_template, request
+from flask.json.provider import DefaultJSONProvider
+
+# Rendered error pages by status code; the templates take no request data
+_error_pages = {}
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    
+    `jsonify` and the `tojson` filter go through `app.json`, so every
+    response gets orjson's encoder, which is several times faster than the
+    stdlib one and serializes NumPy scalars/arrays natively.
+    """
+    
+    @staticmethod
+    def default(o):
+        # Cached data files (services.json_cache) are read-only mappings
+        if isinstance(o, MappingProxyType):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def error_page(status):
+    """
+    Error page response (errors/<status>.html), rendered once and reused.
+    
+    Rendering happens on first use, inside a request, so `url_for` works;
+    later responses just copy the cached bytes. Debug mode re-renders so
+    template edits show up.
+    """
+    body = _error_pages.get(status)
+    if body is None:
+        body = render_template(f'errors/{status}.html').encode()
+        if not current_app.debug:
+            _error_pages[status] = body
+    return current_app.response_class(body, status=status, mimetype='text/html')
+
+def conditional(response):
+    """
+    Tag `response` with a content-hash ETag and answer matching conditional
+    GETs with an empty 304, so unchanged payloads aren't re-sent on repeat polls.
+    """
+    response.add_etag()
+    return response.make_conditional(request)
@@ -1,17 +1,63 @@
 """
 Authentication service for managing users
 """
+import hashlib
+import logging
+import os
 from werkzeug.security import generate_password_hash
 from models.user import User
 
-def init_auth_users():
-    """Initialize default admin user"""
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_ADMIN_PASSWORD = 'admin123'
+ADMIN_HASH_METHOD = 'scrypt'
+# The default admin hash is computed once and shared by every worker process
+ADMIN_HASH_FILENAME = 'admin_hash.bin'
+
+def _admin_hash_fingerprint():
+    """Identify the password/method a stashed hash was generated from"""
+    return hashlib.sha256(f"{ADMIN_HASH_METHOD}:{DEFAULT_ADMIN_PASSWORD}".encode()).hexdigest()
+
+def _default_admin_hash(instance_path):
+    """
+    Load the stashed admin hash, paying the KDF cost only on first startup
+    
+    The stash records the fingerprint of the password and method it was
+    made from; if either changes in code, the stale hash is regenerated.
+    """
+    hash_file = os.path.join(instance_path, ADMIN_HASH_FILENAME)
+    fingerprint = _admin_hash_fingerprint()
+    try:
+        with open(hash_file, 'rb') as f:
+            stored_fingerprint, _, stored_hash = f.read().decode('ascii').partition('\n')
+        if stored_fingerprint == fingerprint and stored_hash:
+            return stored_hash
+        LOGGER.info("Stashed admin hash is out of date; regenerating it.")
+    except FileNotFoundError:
+        pass
+    except (OSError, UnicodeDecodeError) as exc:
+        # Unreadable or corrupt stash: regenerate instead of failing app startup
+        LOGGER.warning("Ignoring unreadable admin hash stash %s: %s", hash_file, exc)
+    
+    password_hash = generate_password_hash(DEFAULT_ADMIN_PASSWORD, method=ADMIN_HASH_METHOD)
+    try:
+        os.makedirs(instance_path, exist_ok=True)
+        # Write then rename so concurrently starting workers never read a partial file
+        tmp_path = f"{hash_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(f"{fingerprint}\n{password_hash}".encode('ascii'))
+        os.replace(tmp_path, hash_file)
+    except OSError as exc:
+        LOGGER.warning("Could not stash admin password hash: %s", exc)
+    return password_hash
+
+def init_auth_users(instance_path):
+    """Initialize default admin user (`instance_path`: the app's instance folder)"""
     if not User.users:
         # Create default admin user: admin / admin123
         admin_user = User.create(
             username='admin',
-            password_hash=generate_password_hash('admin123'),
+            password_hash=_default_admin_hash(instance_path),
             is_admin=True
         )
         print(f"Created default admin user: admin / admin123")
-
@@ -1,13 +1,23 @@
 """
 Data service for fetching dashboard stats and trends
 """
-import json
-import os
+from bisect import bisect_left
+from itertools import islice
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from extensions import cache
+from services.json_cache import derived_from_json
 
+@cache.cached(timeout=300, key_prefix='dash_stats')
 def get_dashboard_stats():
-    """Get dashboard statistics"""
+    """
+    Get dashboard statistics
+    
+    Cached through the app's Flask-Caching instance, so it must be called
+    inside an application context (requests are; scripts need
+    `with app.app_context():`).
+    """
     return {
         'total_jobs': 125000,
         'growth_rate': 12.5,
@@ -21,38 +31,75 @@ def get_dashboard_stats():
         'active_industries': 15
     }
 
+# Constant month axis for the trends series, built once at import
+_DATES = pd.date_range(start='2020-01-01', end='2024-12-01', freq='ME')
+_DATES_ISO = tuple(_DATES.strftime('%Y-%m'))
+_I = np.arange(len(_DATES))
+
+@cache.memoize(timeout=300)
 def get_trends_data(job_role=None):
-    """Get trends data for job roles"""
-    # Generate sample time series data
-    dates = pd.date_range(start='2020-01-01', end='2024-12-01', freq='M')
+    """
+    Get trends data for job roles
     
+    Memoized through the app's Flask-Caching instance, so like
+    `get_dashboard_stats` it needs an application context.
+    """
+    # Generate sample time series data
     if job_role:
         # Simulate role-specific trends
         base_demand = 1000
-        trend = [base_demand + i * 10 + (i % 12) * 50 for i in range(len(dates))]
+        trend = base_demand + _I * 10 + (_I % 12) * 50
     else:
-        trend = [5000 + i * 50 + (i % 12) * 200 for i in range(len(dates))]
+        trend = 5000 + _I * 50 + (_I % 12) * 200
     
+    last_year = trend[-12:]
+    # Plain lists, so any JSON encoder can serialize the result
     return {
-        'dates': [d.strftime('%Y-%m') for d in dates],
-        'demand': trend,
-        'forecast': trend[-12:] + [t * 1.15 for t in trend[-12:]]
+        'dates': list(_DATES_ISO),
+        'demand': trend.tolist(),
+        'forecast': last_year.tolist() + (last_year * 1.15).tolist()
     }
 
+# Fallback catalog, used when data/job_roles.json is missing
+DEFAULT_JOB_ROLES = (
+    'Data Scientist', 'Machine Learning Engineer', 'Software Engineer',
+    'DevOps Engineer', 'Cloud Architect', 'Data Analyst', 'Product Manager',
+    'Full Stack Developer', 'Backend Developer', 'Frontend Developer'
+)
+
+@derived_from_json('data/job_roles.json', default=DEFAULT_JOB_ROLES)
+def _role_suffix_index(all_roles):
+    """
+    Build a sorted suffix array over the lowercased roles.
+    
+    Every role contributes each of its suffixes, so a substring query is a
+    prefix query on the suffixes: one bisect instead of a scan of the catalog.
+    
+    Returns:
+        Tuple of (roles in catalog order, sorted suffixes, index of the role
+        each suffix came from, lowercased roles in catalog order)
+    """
+    roles_lower = tuple(role.lower() for role in all_roles)
+    entries = sorted(
+        (lowered[start:], position)
+        for position, lowered in enumerate(roles_lower)
+        for start in range(len(lowered))
+    )
+    return (all_roles, [suffix for suffix, _ in entries], [position for _, position in entries], roles_lower)
+
 def search_job_role(query):
     """Search for job roles matching query"""
-    roles_file = 'data/job_roles.json'
-    if os.path.exists(roles_file):
-        with open(roles_file, 'r') as f:
-            all_roles = json.load(f)
-    else:
-        all_roles = [
-            'Data Scientist', 'Machine Learning Engineer', 'Software Engineer',
-            'DevOps Engineer', 'Cloud Architect', 'Data Analyst', 'Product Manager',
-            'Full Stack Developer', 'Backend Developer', 'Frontend Developer'
-        ]
+    all_roles, suffixes, positions, roles_lower = _role_suffix_index()
     
     query_lower = query.lower()
-    matches = [role for role in all_roles if query_lower in role.lower()]
-    return matches[:10]
-
+    lo = bisect_left(suffixes, query_lower)
+    hi = bisect_left(suffixes, query_lower + '\U0010ffff', lo)
+    if hi - lo > len(roles_lower):
+        # Short queries hit more suffixes than there are roles: scanning the
+        # pre-lowered catalog and stopping at 10 matches is cheaper
+        return list(islice(
+            (role for role, lowered in zip(all_roles, roles_lower) if query_lower in lowered), 10
+        ))
+    # Report matches in catalog order, like a linear scan would
+    matches = sorted(set(positions[lo:hi]))
+    return [all_roles[position] for position in matches[:10]]
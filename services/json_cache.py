@@ -0,0 +1,77 @@
+"""
+JSON file reading, writing and cached loading for the data files
+"""
+import os
+from functools import lru_cache, wraps
+from pathlib import Path
+from types import MappingProxyType
+
+import orjson
+
+def read_json(path):
+    """Parse a JSON file with a single read and orjson (mutable, uncached)"""
+    return orjson.loads(Path(path).read_bytes())
+
+def write_json(path, data):
+    """Serialize `data` with orjson and write it in a single call"""
+    Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+def _freeze(value):
+    """Recursively convert parsed JSON into read-only containers"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+@lru_cache(maxsize=32)
+def _load_json_cached(path, mtime_ns):
+    """Parse a JSON file once per (path, modification time)"""
+    return _freeze(read_json(path))
+
+def load_json(path, default=None):
+    """
+    Load a JSON data file, re-parsing it only when it changes on disk.
+    
+    The result is shared between callers, so it is returned read-only
+    (dicts as MappingProxyType, lists as tuples); copy before mutating.
+    
+    Args:
+        path: Path of the JSON file
+        default: Value returned when the file does not exist
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return default
+    return _load_json_cached(path, mtime_ns)
+
+def derived_from_json(path, default=None):
+    """
+    Decorator caching data derived from a JSON file until the file changes.
+    
+    The decorated function receives the file's frozen contents (or `default`
+    when the file is missing) and is called again only when the file's
+    modification time does; the wrapper takes no arguments. Its result is
+    shared between callers, so treat it as read-only.
+    
+    Args:
+        path: Path of the JSON file
+        default: Value passed to the function when the file does not exist
+    """
+    def decorator(build):
+        @lru_cache(maxsize=1)
+        def derive(mtime_ns):
+            data = default if mtime_ns is None else _load_json_cached(path, mtime_ns)
+            return build(data)
+        
+        @wraps(build)
+        def wrapper():
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            return derive(mtime_ns)
+        wrapper.cache_clear = derive.cache_clear
+        return wrapper
+    return decorator
@@ -1,53 +1,268 @@
 """
 Prediction service for processing datasets and running predictions
 """
+import hashlib
 import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from ml.model import JobMarketPredictor
+from pyarrow import feather
+from ml.aggregation import build_monthly_frame
 
 LOGGER = logging.getLogger(__name__)
 
+# Background predictions so /predict can hand back a job ID instead of
+# holding the request worker for the whole model run. Jobs live in this
+# process only: async predictions need a single (multi-threaded) worker,
+# otherwise a poll can reach a worker that never saw the job.
+_prediction_executor = ThreadPoolExecutor(
+    max_workers=min(2, os.cpu_count() or 1),
+    thread_name_prefix='prediction'
+)
+# job_id -> [future, finished_at (monotonic seconds, None while running)]
+_prediction_jobs = {}
+_prediction_jobs_lock = threading.Lock()
+# Finished jobs that are never polled are dropped after this long
+PREDICTION_JOB_TTL = 3600
+
+# Columns the prediction pipeline reads; everything else is skipped at parse time
+ROLE_COLUMNS = ['job_title', 'job_role', 'role']
+SKILL_COLUMNS = ['skills', 'required_skills']
+PREDICTION_COLUMNS = ['date', 'postings_count'] + ROLE_COLUMNS + SKILL_COLUMNS
+
+@lru_cache(maxsize=64)
+def _file_digest(filepath, mtime_ns, size):
+    """SHA-256 of a file, streamed in 64KB blocks; memoized per file version"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def feather_cache_path(filepath):
+    """Content-addressed Feather twin of an upload (uploads/cache/<sha256>.feather)"""
+    stat = os.stat(filepath)
+    digest = _file_digest(filepath, stat.st_mtime_ns, stat.st_size)
+    return os.path.join(os.path.dirname(filepath), 'cache', f"{digest}.feather")
+
+def load_prediction_frame(filepath):
+    """
+    Load the prediction columns of an upload
+    
+    The CSV is parsed once; later loads memory-map its Feather twin, which
+    a changed file (new mtime/size, hence new digest) never matches.
+    """
+    cache_path = feather_cache_path(filepath)
+    try:
+        return feather.read_table(cache_path, memory_map=True).to_pandas()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Unreadable twin (e.g. truncated): its digest never changes, so drop
+        # it and re-parse rather than failing every later load
+        LOGGER.warning("Discarding unreadable Feather cache %s: %s", cache_path, e)
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
+    
+    df = _read_prediction_csv(filepath)
+    # Uncompressed, so the memory-mapped read doesn't have to decompress;
+    # written then renamed so concurrent loads never see a partial file
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        LOGGER.warning("Could not cache %s as Feather: %s", filepath, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return df
+
+def _read_prediction_csv(filepath):
+    """Read only the columns used for predictions, with explicit dtypes"""
+    header = pd.read_csv(filepath, nrows=0).columns
+    usecols = [col for col in PREDICTION_COLUMNS if col in header]
+    if not usecols:
+        # Unknown layout: let the predictor fall back on whatever is there
+        return pd.read_csv(filepath)
+    
+    dtype = {col: 'category' for col in ROLE_COLUMNS if col in usecols}
+    dtype.update({col: 'string' for col in SKILL_COLUMNS if col in usecols})
+    # pyarrow's multithreaded parser; only the pruned columns are materialized
+    return pd.read_csv(
+        filepath,
+        usecols=usecols,
+        dtype=dtype,
+        parse_dates=['date'] if 'date' in usecols else False,
+        engine='pyarrow'
+    )
+
+@lru_cache(maxsize=1)
+def get_predictor():
+    """Shared predictor, so loaded LSTM models are reused across requests"""
+    # Imported on first use: ml.model pulls in TensorFlow, which non-ML
+    # routes (and app startup) shouldn't pay for
+    from ml.model import JobMarketPredictor
+    return JobMarketPredictor()
+
+def monthly_sidecar_path(filepath):
+    """Path of the per-role monthly aggregate cached next to an upload"""
+    return f"{filepath}.monthly.parquet"
+
+# Uploads up to this size are aggregated inline; larger ones in the background
+INLINE_AGGREGATION_MAX_BYTES = 1024 * 1024
+
+def _write_monthly_series(filepath):
+    """Aggregate an upload and write its monthly sidecar"""
+    try:
+        monthly = build_monthly_frame(load_prediction_frame(filepath))
+        if monthly is None:
+            return False
+        sidecar = monthly_sidecar_path(filepath)
+        # Write then rename so a concurrent /predict never reads a partial file
+        tmp_path = f"{sidecar}.tmp"
+        monthly.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, sidecar)
+        return True
+    except Exception as e:
+        LOGGER.warning("Could not cache monthly series for %s: %s", filepath, e)
+        return False
+
+def cache_monthly_series(filepath):
+    """
+    Precompute per-role monthly series for an uploaded CSV
+    
+    Small files are aggregated before returning; larger ones are queued on
+    the prediction executor so the upload request doesn't wait on the
+    parse. Until the sidecar exists, predictions aggregate the CSV themselves.
+    """
+    if not filepath.lower().endswith('.csv'):
+        return False
+    if os.path.getsize(filepath) > INLINE_AGGREGATION_MAX_BYTES:
+        _prediction_executor.submit(_write_monthly_series, filepath)
+        return True
+    return _write_monthly_series(filepath)
+
+def load_monthly_series(filepath):
+    """Load the cached monthly aggregate if it is newer than the upload"""
+    sidecar = monthly_sidecar_path(filepath)
+    try:
+        if os.path.getmtime(sidecar) < os.path.getmtime(filepath):
+            return None
+        return pd.read_parquet(sidecar)
+    except Exception:
+        return None
+
 def process_dataset(filepath):
     """Process uploaded dataset"""
     try:
-        df = pd.read_csv(filepath)
+        # The preview only needs the first rows...
+        sample = pd.read_csv(filepath, nrows=5)
+        columns = list(sample.columns)
+        # ...and the row count only needs a single parsed column. Positional
+        # usecols with the C engine also copes with an unnamed first column
+        # (e.g. a DataFrame.to_csv index), which pyarrow can't select
+        rows = len(pd.read_csv(filepath, usecols=[0])) if columns else 0
         return {
-            'rows': len(df),
-            'columns': list(df.columns),
-            'sample': df.head(5).to_dict('records')
+            'rows': rows,
+            'columns': columns,
+            'sample': sample.to_dict(orient='records')
         }
     except Exception as e:
         raise Exception(f"Error processing dataset: {str(e)}")
 
+def summarize_predictions(predictions):
+    """Aggregate the columnar demand predictions with vectorized reductions"""
+    demands = predictions['demand'].to_numpy(dtype=np.float64)
+    return {
+        'total_predictions': len(predictions),
+        'avg_demand': float(demands.mean()) if demands.size else 0,
+        'high_demand_roles': predictions.loc[demands > 1000, 'role'].head(5).tolist()
+    }
+
 def run_prediction(filepath):
     """Run prediction on dataset"""
     try:
         # Load predictor
-        predictor = JobMarketPredictor()
+        predictor = get_predictor()
         
         # Load and process data
-        df = pd.read_csv(filepath)
+        df = load_prediction_frame(filepath)
         
-        # Run predictions (LSTM + fallbacks)
+        # Run predictions (LSTM + fallbacks); kept columnar until serialization
         try:
-            predictions = predictor.predict_demand(df)
+            predictions = predictor.predict_demand(
+                df, monthly=load_monthly_series(filepath), as_records=False
+            )
         except Exception as model_error:
             LOGGER.error("LSTM prediction failed: %s. Falling back to heuristic model.", model_error)
-            predictions = predictor.fallback_predictions(df)
+            predictions = predictor.fallback_predictions(df, as_records=False)
         
         skill_gap_scores = predictor.analyze_skill_gaps(df)
         saturation_scores = predictor.predict_saturation(df)
         
         return {
-            'predictions': predictions,
+            'predictions': predictions.to_dict(orient='records'),
             'skill_gap_scores': skill_gap_scores,
             'saturation_scores': saturation_scores,
-            'summary': {
-                'total_predictions': len(predictions),
-                'avg_demand': sum(p['demand'] for p in predictions) / len(predictions) if predictions else 0,
-                'high_demand_roles': [p['role'] for p in predictions if p['demand'] > 1000][:5]
-            }
+            'summary': summarize_predictions(predictions)
         }
     except Exception as e:
         raise Exception(f"Error running prediction: {str(e)}")
 
+def _expire_prediction_jobs(now):
+    """Forget finished jobs older than PREDICTION_JOB_TTL (caller holds the lock)"""
+    expired = [
+        job_id for job_id, (_, finished_at) in _prediction_jobs.items()
+        if finished_at is not None and now - finished_at > PREDICTION_JOB_TTL
+    ]
+    for job_id in expired:
+        del _prediction_jobs[job_id]
+
+def submit_prediction(filepath):
+    """Queue a prediction run and return its job ID"""
+    job_id = uuid.uuid4().hex
+    entry = [None, None]
+    with _prediction_jobs_lock:
+        _expire_prediction_jobs(time.monotonic())
+        entry[0] = _prediction_executor.submit(run_prediction, filepath)
+        _prediction_jobs[job_id] = entry
+    
+    def mark_finished(_future):
+        entry[1] = time.monotonic()
+    
+    entry[0].add_done_callback(mark_finished)
+    return job_id
+
+def get_prediction_status(job_id):
+    """
+    Get the state of a queued prediction
+    
+    Returns:
+        None for unknown (or expired) jobs, otherwise a dict with `status` of
+        'pending', 'done' (with `results`) or 'error' (with `error`).
+        Finished jobs are forgotten once reported, or after PREDICTION_JOB_TTL.
+    """
+    with _prediction_jobs_lock:
+        _expire_prediction_jobs(time.monotonic())
+        entry = _prediction_jobs.get(job_id)
+        if entry is None:
+            return None
+        future = entry[0]
+        if not future.done():
+            return {'status': 'pending'}
+        del _prediction_jobs[job_id]
+    
+    error = future.exception()
+    if error is not None:
+        return {'status': 'error', 'error': str(error)}
+    return {'status': 'done', 'results': future.result()}
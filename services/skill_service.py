@@ -1,52 +1,77 @@
 """
 Skill service for skill gap analysis
 """
-import json
-import os
+from services.json_cache import derived_from_json, load_json
 
-def get_required_skills(job_role, experience_level='mid'):
-    """Get required skills for a job role"""
-    skills_file = 'data/skills_database.json'
+# Default skills database, used when data/skills_database.json is missing
+DEFAULT_SKILLS_DB = {
+    'Data Scientist': {
+        'entry': ['Python', 'SQL', 'Statistics', 'Data Analysis'],
+        'mid': ['Python', 'SQL', 'Statistics', 'Machine Learning', 'Pandas', 'NumPy', 'Scikit-learn'],
+        'senior': ['Python', 'SQL', 'Statistics', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'MLOps', 'Cloud Computing']
+    },
+    'Software Engineer': {
+        'entry': ['Programming', 'Data Structures', 'Algorithms', 'Git'],
+        'mid': ['Programming', 'Data Structures', 'Algorithms', 'Git', 'System Design', 'Testing'],
+        'senior': ['Programming', 'Data Structures', 'Algorithms', 'Git', 'System Design', 'Architecture', 'Microservices', 'Cloud']
+    }
+}
+
+EXPERIENCE_LEVELS = ('entry', 'mid', 'senior')
+_EMPTY_SKILLS = (frozenset(), ())
+
+@derived_from_json('data/skills_database.json', default=DEFAULT_SKILLS_DB)
+def _skill_table(skills_db):
+    """
+    Flatten the skills database into a (role, level) lookup table of
+    (lowercased skill set, skills in original order/casing).
     
-    if os.path.exists(skills_file):
-        with open(skills_file, 'r') as f:
-            skills_db = json.load(f)
-    else:
-        # Default skills database
-        skills_db = {
-            'Data Scientist': {
-                'entry': ['Python', 'SQL', 'Statistics', 'Data Analysis'],
-                'mid': ['Python', 'SQL', 'Statistics', 'Machine Learning', 'Pandas', 'NumPy', 'Scikit-learn'],
-                'senior': ['Python', 'SQL', 'Statistics', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'MLOps', 'Cloud Computing']
-            },
-            'Software Engineer': {
-                'entry': ['Programming', 'Data Structures', 'Algorithms', 'Git'],
-                'mid': ['Programming', 'Data Structures', 'Algorithms', 'Git', 'System Design', 'Testing'],
-                'senior': ['Programming', 'Data Structures', 'Algorithms', 'Git', 'System Design', 'Architecture', 'Microservices', 'Cloud']
-            }
+    Standard levels a role doesn't define are pre-resolved to its 'mid'
+    entry, so lookups don't need a fallback chain.
+    """
+    table = {}
+    for role, levels in skills_db.items():
+        if not hasattr(levels, 'items'):
+            continue
+        entries = {
+            level: (frozenset(skill.lower() for skill in skills), tuple(skills))
+            for level, skills in levels.items()
         }
-    
-    role_skills = skills_db.get(job_role, {})
-    return role_skills.get(experience_level, role_skills.get('mid', []))
+        fallback = entries.get('mid', _EMPTY_SKILLS)
+        for level in EXPERIENCE_LEVELS:
+            table[(role, level)] = entries.get(level, fallback)
+        for level, entry in entries.items():
+            table[(role, level)] = entry
+    return table
+
+def get_skill_entry(job_role, experience_level='mid'):
+    """Get (lowercased skill set, required skills) for a job role in one lookup"""
+    table = _skill_table()
+    entry = table.get((job_role, experience_level))
+    if entry is None:
+        # Non-standard level: same 'mid' fallback as the standard ones
+        entry = table.get((job_role, 'mid'), _EMPTY_SKILLS)
+    return entry
+
+def get_required_skills(job_role, experience_level='mid'):
+    """Get required skills for a job role"""
+    return get_skill_entry(job_role, experience_level)[1]
 
 def analyze_skill_gap(job_role, experience_level, user_skills):
     """Analyze skill gap between user skills and required skills"""
-    required = get_required_skills(job_role, experience_level)
-    user_skills_lower = [s.lower() for s in user_skills]
-    required_lower = [s.lower() for s in required]
+    required_set, required = get_skill_entry(job_role, experience_level)
+    user_set = {s.lower() for s in user_skills}
+    matching_lower = required_set & user_set
     
-    missing_skills = [s for s in required if s.lower() not in user_skills_lower]
-    matching_skills = [s for s in required if s.lower() in user_skills_lower]
+    # Walk `required` to keep its order and original casing in the output
+    missing_skills = [s for s in required if s.lower() not in matching_lower]
+    matching_skills = [s for s in required if s.lower() in matching_lower]
     
     match_percentage = (len(matching_skills) / len(required) * 100) if required else 0
     
     # Recommend additional skills
-    all_skills_file = 'data/all_skills.json'
-    recommended = []
-    if os.path.exists(all_skills_file):
-        with open(all_skills_file, 'r') as f:
-            all_skills = json.load(f)
-            recommended = [s for s in all_skills if s.lower() not in user_skills_lower][:5]
+    all_skills = load_json('data/all_skills.json', default=())
+    recommended = [s for s in all_skills if s.lower() not in user_set][:5]
     
     return {
         'required_skills': required,
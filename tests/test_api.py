@@ -1,8 +1,12 @@
 """
 Basic API endpoint tests
 """
+import os
+import shutil
+import time
 import unittest
 from app import app
+from services.prediction_service import feather_cache_path
 
 class TestAPI(unittest.TestCase):
     """Test API endpoints"""
@@ -29,6 +33,70 @@ class TestAPI(unittest.TestCase):
         data = response.get_json()
         self.assertTrue(data['success'])
         self.assertIn('stats', data)
+    
+    def test_api_dashboard_stats_not_modified(self):
+        """Test dashboard stats answers a matching ETag with 304"""
+        response = self.app.get('/api/dashboard/stats')
+        etag = response.headers['ETag']
+        response = self.app.get('/api/dashboard/stats', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_blog_post(self):
+        """Test blog post page and unknown post"""
+        response = self.app.get('/blog/1')
+        self.assertEqual(response.status_code, 200)
+        response = self.app.get('/blog/does-not-exist')
+        self.assertEqual(response.status_code, 404)
+    
+    def test_api_skill_gap(self):
+        """Test skill gap API"""
+        response = self.app.post('/api/skill-gap', json={
+            'job_role': 'Data Scientist',
+            'experience_level': 'mid',
+            'skills': ['python', 'SQL']
+        })
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()['result']
+        self.assertIn('Python', result['matching_skills'])
+        self.assertNotIn('Python', result['missing_skills'])
+
+    def test_api_search(self):
+        """Test role search matches substrings case-insensitively"""
+        response = self.app.get('/api/search?q=ENGINEER')
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertIn('Software Engineer', results)
+        self.assertTrue(all('engineer' in role.lower() for role in results))
+
+    def test_api_predict_async(self):
+        """Test an async prediction can be polled until it is done"""
+        filepath = os.path.join('uploads', 'test_async_predict.csv')
+        shutil.copy('data/job_postings_sample.csv', filepath)
+        cache_path = feather_cache_path(filepath)
+        self.addCleanup(lambda: [os.remove(p) for p in (filepath, cache_path) if os.path.exists(p)])
+        
+        response = self.app.post('/api/predict', json={'filename': 'test_async_predict.csv', 'async': True})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()['job_id']
+        
+        deadline = time.monotonic() + 120
+        while True:
+            response = self.app.get(f'/api/predict/{job_id}')
+            data = response.get_json()
+            if data['status'] != 'pending' or time.monotonic() > deadline:
+                break
+            time.sleep(0.1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['status'], 'done')
+        self.assertIn('predictions', data['results'])
+        # Reported jobs are forgotten
+        self.assertEqual(self.app.get(f'/api/predict/{job_id}').status_code, 404)
+    
+    def test_api_predict_unknown_job(self):
+        """Test polling an unknown job ID returns 404"""
+        response = self.app.get('/api/predict/does-not-exist')
+        self.assertEqual(response.status_code, 404)
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,17 +1,29 @@
 """Unit tests for the LSTM demand forecasting pipeline."""
 
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import joblib
 import numpy as np
 import pandas as pd
+import tensorflow as tf
 from sklearn.preprocessing import MinMaxScaler
 from tensorflow.keras.layers import LSTM, Dense
 from tensorflow.keras.models import Sequential
 
+import ml.model as model_module
+from ml.aggregation import build_monthly_frame
 from ml.model import JobMarketPredictor, slugify_role
-from ml.train_lstm import WINDOW_SIZE, create_sequences, prepare_role_series
+from ml.train_lstm import (
+    WINDOW_SIZE,
+    create_sequences,
+    prepare_role_series,
+    tflite_filename,
+    train_role_model,
+)
 
 
 class TestLSTMUtilities(unittest.TestCase):
@@ -37,6 +49,20 @@ class TestLSTMUtilities(unittest.TestCase):
         self.assertEqual(len(series), 6)
         self.assertEqual(series.index.freqstr, "M")
 
+    def test_build_monthly_frame_keeps_tie_order(self):
+        # 12 roles with one posting each: the top-10 cut must follow first
+        # appearance, not the alphabetical category order
+        roles = ["Zeta", "Yank", "Xray", "Whis", "Vict", "Unif",
+                 "Tang", "Sier", "Rome", "Queb", "Papa", "Osca"]
+        df = pd.DataFrame(
+            {
+                "date": pd.date_range("2023-01-01", periods=len(roles), freq="MS"),
+                "job_title": roles,
+            }
+        )
+        monthly = build_monthly_frame(df)
+        self.assertEqual(monthly["role"].unique().tolist(), roles[:10])
+
 
 class TestLSTMIntegration(unittest.TestCase):
     """Integration tests covering model loading and fallbacks."""
@@ -51,13 +77,14 @@ class TestLSTMIntegration(unittest.TestCase):
         self.role_slug = slugify_role(self.role_name)
         self.model_path = os.path.join("models", f"lstm_{self.role_slug}.keras")
         self.scaler_path = os.path.join("models", f"scaler_{self.role_slug}.pkl")
+        self.tflite_path = os.path.join("models", f"lstm_{self.role_slug}.tflite")
         self._cleanup_role_files()
 
     def tearDown(self):
         self._cleanup_role_files()
 
     def _cleanup_role_files(self):
-        for path in [self.model_path, self.scaler_path]:
+        for path in [self.model_path, self.scaler_path, self.tflite_path]:
             if os.path.exists(path):
                 os.remove(path)
 
@@ -84,6 +111,12 @@ class TestLSTMIntegration(unittest.TestCase):
         self.assertIsNotNone(model)
         self.assertIsNotNone(scaler)
 
+    def test_tflite_model_persisted(self):
+        values = np.arange(1, WINDOW_SIZE + 5)
+        self._save_dummy_model(values)
+        self.predictor._load_lstm_resources(self.role_name)
+        self.assertTrue(os.path.exists(self.tflite_path))
+
     def test_predict_demand_with_lstm(self):
         values = np.arange(1, WINDOW_SIZE + 5)
         self._save_dummy_model(values)
@@ -99,6 +132,22 @@ class TestLSTMIntegration(unittest.TestCase):
         self.assertEqual(len(predictions), 1)
         self.assertEqual(predictions[0]["role"], self.role_name)
 
+    def test_predict_demand_from_monthly_frame(self):
+        dates = pd.date_range("2023-01-01", periods=WINDOW_SIZE + 1, freq="M")
+        df = pd.DataFrame(
+            {
+                "date": dates,
+                "job_title": ["Missing Model"] * len(dates),
+                "postings_count": np.arange(len(dates)),
+            }
+        )
+        monthly = self.predictor.build_monthly_frame(df)
+        self.assertEqual(list(monthly.columns), ["role", "date", "count"])
+        self.assertEqual(
+            self.predictor.predict_demand(df, monthly=monthly),
+            self.predictor.predict_demand(df),
+        )
+
     def test_fallback_when_model_missing(self):
         dates = pd.date_range("2023-01-01", periods=WINDOW_SIZE + 1, freq="M")
         df = pd.DataFrame(
@@ -113,6 +162,69 @@ class TestLSTMIntegration(unittest.TestCase):
         self.assertGreaterEqual(predictions[0]["demand"], 0)
 
 
+
+class TestTFLiteQuantization(unittest.TestCase):
+    """Quantized exports and which TFLite file the predictor picks."""
+
+    role_name = "Quantized Role"
+
+    @classmethod
+    def setUpClass(cls):
+        cls.models_dir = tempfile.mkdtemp()
+        series = pd.Series(
+            np.arange(1, WINDOW_SIZE + 6, dtype=float),
+            index=pd.date_range("2023-01-01", periods=WINDOW_SIZE + 5, freq="MS"),
+        )
+        cls.trained = train_role_model(cls.role_name, series, cls.models_dir, quantization="int8")
+        slug = slugify_role(cls.role_name)
+        cls.model_path = os.path.join(cls.models_dir, f"lstm_{slug}.keras")
+        cls.int8_path = os.path.join(cls.models_dir, tflite_filename(slug, "int8"))
+        cls.fp16_path = os.path.join(cls.models_dir, tflite_filename(slug, "fp16"))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.models_dir, ignore_errors=True)
+
+    def setUp(self):
+        if os.path.exists(self.fp16_path):
+            os.remove(self.fp16_path)
+        # Fresh export: newer than the .keras model
+        mtime = os.stat(self.model_path).st_mtime
+        os.utime(self.int8_path, (mtime + 1, mtime + 1))
+
+    def _loaded_model_bytes(self, allow_int8):
+        predictor = JobMarketPredictor(allow_int8=allow_int8)
+        predictor.models_dir = self.models_dir
+        with mock.patch.object(model_module.tf.lite, "Interpreter", wraps=tf.lite.Interpreter) as interpreter:
+            model, _ = predictor._load_lstm_resources(self.role_name)
+        self.assertIsNotNone(model)
+        return interpreter.call_args.kwargs["model_content"]
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_int8_export_written(self):
+        self.assertTrue(self.trained)
+        self.assertTrue(os.path.exists(self.int8_path))
+        self.assertEqual(os.path.basename(self.int8_path), "lstm_quantized_role.int8.tflite")
+
+    def test_int8_preferred_when_allowed(self):
+        self.assertEqual(self._loaded_model_bytes(allow_int8=True), self._read(self.int8_path))
+        self.assertFalse(os.path.exists(self.fp16_path))
+
+    def test_int8_ignored_by_default(self):
+        content = self._loaded_model_bytes(allow_int8=False)
+        self.assertNotEqual(content, self._read(self.int8_path))
+        self.assertEqual(content, self._read(self.fp16_path))
+
+    def test_stale_int8_export_ignored(self):
+        mtime = os.stat(self.model_path).st_mtime
+        os.utime(self.int8_path, (mtime - 60, mtime - 60))
+        content = self._loaded_model_bytes(allow_int8=True)
+        self.assertNotEqual(content, self._read(self.int8_path))
+        self.assertEqual(content, self._read(self.fp16_path))
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,152 @@
+"""
+Service layer tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+from werkzeug.security import check_password_hash
+from services import prediction_service
+from services.json_cache import derived_from_json, write_json
+from services.auth_service import ADMIN_HASH_FILENAME, DEFAULT_ADMIN_PASSWORD, _default_admin_hash
+from services.prediction_service import (
+    feather_cache_path, load_prediction_frame, process_dataset, run_prediction
+)
+
+SAMPLE_CSV = 'data/job_postings_sample.csv'
+
+class TestPredictionService(unittest.TestCase):
+    """Test the prediction pipeline on uploaded files"""
+    
+    def setUp(self):
+        """Copy the sample dataset into a scratch upload folder"""
+        self.upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.upload_dir, ignore_errors=True)
+        self.filepath = os.path.join(self.upload_dir, 'sample.csv')
+        shutil.copy(SAMPLE_CSV, self.filepath)
+    
+    def test_run_prediction_matches_baseline(self):
+        """Test role ranking (including ties) matches the original pipeline"""
+        results = run_prediction(self.filepath)
+        # Tied roles keep their order of first appearance in the CSV
+        roles = [
+            'Data Scientist', 'Software Engineer', 'Machine Learning Engineer',
+            'Data Analyst', 'DevOps Engineer', 'ML Engineer', 'Cloud Architect'
+        ]
+        self.assertEqual([p['role'] for p in results['predictions']], roles)
+        self.assertEqual(
+            [(p['current_demand'], p['demand']) for p in results['predictions']],
+            [(3, 3), (2, 2), (1, 1), (1, 1), (1, 1), (1, 1), (1, 1)]
+        )
+        self.assertEqual([s['role'] for s in results['saturation_scores']], roles)
+        self.assertEqual(
+            [s['saturation_score'] for s in results['saturation_scores']],
+            [100, 66.67, 33.33, 33.33, 33.33, 33.33, 33.33]
+        )
+    
+    def test_prediction_frame_feather_cache(self):
+        """Test the Feather twin on cache miss, hit and corruption"""
+        cache_path = feather_cache_path(self.filepath)
+        
+        # Miss: the CSV is parsed and an uncompressed twin is written
+        expected = load_prediction_frame(self.filepath)
+        self.assertTrue(os.path.exists(cache_path))
+        # Uncompressed: a memory-mapped read allocates no Arrow buffers
+        allocated = pa.total_allocated_bytes()
+        table = feather.read_table(cache_path, memory_map=True)
+        self.assertEqual(pa.total_allocated_bytes(), allocated)
+        del table
+        self.assertEqual(os.listdir(os.path.dirname(cache_path)), [os.path.basename(cache_path)])
+        
+        # Hit: served from the twin without touching the CSV parser
+        with mock.patch.object(prediction_service, '_read_prediction_csv') as read_csv:
+            cached = load_prediction_frame(self.filepath)
+        read_csv.assert_not_called()
+        self.assertTrue(cached.equals(expected))
+        
+        # Corrupt: the bad twin is dropped, the CSV re-parsed and re-cached
+        with open(cache_path, 'r+b') as f:
+            f.truncate(16)
+        self.assertTrue(load_prediction_frame(self.filepath).equals(expected))
+        self.assertTrue(feather.read_table(cache_path).to_pandas().equals(expected))
+    def test_process_dataset_unnamed_index_column(self):
+        """Test row counting when the first header cell is empty"""
+        # DataFrame.to_csv writes its index under an empty header
+        pd.read_csv(SAMPLE_CSV).to_csv(self.filepath)
+        summary = process_dataset(self.filepath)
+        self.assertEqual(summary['rows'], len(pd.read_csv(SAMPLE_CSV)))
+        self.assertEqual(summary['columns'][0], 'Unnamed: 0')
+
+class TestAdminHashStash(unittest.TestCase):
+    """Test the stashed default admin password hash"""
+    
+    def setUp(self):
+        """Use a scratch instance folder"""
+        self.instance_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.instance_path, ignore_errors=True)
+        self.hash_file = os.path.join(self.instance_path, ADMIN_HASH_FILENAME)
+    
+    def assert_regenerated(self):
+        """The returned hash is valid and the stash holds it again"""
+        password_hash = _default_admin_hash(self.instance_path)
+        self.assertTrue(check_password_hash(password_hash, DEFAULT_ADMIN_PASSWORD))
+        self.assertEqual(_default_admin_hash(self.instance_path), password_hash)
+    
+    def test_stale_stash_is_regenerated(self):
+        """Test a stash made from another password/method is replaced"""
+        with open(self.hash_file, 'w') as f:
+            f.write('stale-fingerprint\nscrypt:32768:8:1$salt$hash')
+        self.assert_regenerated()
+    
+    def test_corrupt_stash_is_regenerated(self):
+        """Test non-ASCII stash contents don't break startup"""
+        with open(self.hash_file, 'wb') as f:
+            f.write(b'\xff\xfe\x00garbage')
+        self.assert_regenerated()
+    
+    def test_unreadable_stash_is_regenerated(self):
+        """Test a stash path that can't be read as a file"""
+        os.makedirs(self.hash_file)
+        password_hash = _default_admin_hash(self.instance_path)
+        self.assertTrue(check_password_hash(password_hash, DEFAULT_ADMIN_PASSWORD))
+
+class TestDerivedFromJson(unittest.TestCase):
+    """Tests for data cached against a JSON file's modification time"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.path = os.path.join(self.tmpdir, 'roles.json')
+        self.builds = []
+        
+        @derived_from_json(self.path, default=('Default Role',))
+        def upper_roles(roles):
+            self.builds.append(roles)
+            return tuple(role.upper() for role in roles)
+        self.upper_roles = upper_roles
+    
+    def test_missing_file_uses_default(self):
+        """Test the default is derived once while the file is missing"""
+        self.assertEqual(self.upper_roles(), ('DEFAULT ROLE',))
+        self.assertEqual(self.upper_roles(), ('DEFAULT ROLE',))
+        self.assertEqual(len(self.builds), 1)
+    
+    def test_rebuilt_when_file_changes(self):
+        """Test the derived data is reused until the file changes"""
+        write_json(self.path, ['Analyst'])
+        self.assertEqual(self.upper_roles(), ('ANALYST',))
+        self.assertIs(self.upper_roles(), self.upper_roles())
+        self.assertEqual(len(self.builds), 1)
+        
+        write_json(self.path, ['Analyst', 'Engineer'])
+        mtime = os.stat(self.path).st_mtime + 1
+        os.utime(self.path, (mtime, mtime))
+        self.assertEqual(self.upper_roles(), ('ANALYST', 'ENGINEER'))
+        self.assertEqual(len(self.builds), 2)
+
+if __name__ == '__main__':
+    unittest.main()